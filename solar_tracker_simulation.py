@@ -12,12 +12,27 @@ Requirements:
 - 20-30s animation output
 """
 
+import math
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
+from matplotlib.animation import FFMpegWriter, PillowWriter
 from matplotlib.patches import Wedge, Circle
 import matplotlib.patches as mpatches
 
+try:
+    from numba import njit, prange, set_num_threads
+except ImportError:
+    # Numba is optional: without it the kernels below run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+    def set_num_threads(n):
+        pass
+
 # ============================================================================
 # PHYSICAL PARAMETERS
 # ============================================================================
@@ -33,6 +48,7 @@ tau_max = 20.0
 # Simulation parameters
 T_sim = 120.0  # Total simulation time (seconds)
 dt = 0.01      # Time step for RK4 integration
+i10 = int(round(10.0 / dt))  # Index of t = 10s on the simulation time grid
 
 # ============================================================================
 # SUN REFERENCE TRAJECTORY
@@ -78,60 +94,98 @@ def phi_sun_dot(t):
 # ============================================================================
 # RK4 INTEGRATOR
 # ============================================================================
-def rk4_step(state, t, dt, controller_func, tau_max, I, b):
+def rk4_step(phi, omega, phi_sun_t, dt, controller_func, tau_max, I, b):
     """
     Single RK4 integration step for 2nd-order system.
     
-    State: [φ, ω] where φ is angle (deg), ω is angular velocity (deg/s)
+    State: (φ, ω) where φ is angle (deg), ω is angular velocity (deg/s)
     
     Dynamics:
         φ̇ = ω
         ω̇ = (τ - b*ω) / I
     
     Args:
-        state: [φ, ω] current state
-        t: Current time
+        phi: Current angle (degrees)
+        omega: Current angular velocity (deg/s)
+        phi_sun_t: Sun azimuth setpoint at the current time (degrees)
         dt: Time step
-        controller_func: Function(φ, ω, t, integral) -> (τ, integral_new)
+        controller_func: Function(φ, ω, φ_sun) -> (τ, integral_new),
+            e.g. PIController.compute
         tau_max: Maximum torque limit
         I: Moment of inertia
         b: Damping coefficient
     
     Returns:
-        new_state: [φ_new, ω_new]
+        phi_new, omega_new: Updated state
         torque_applied: Actual torque applied (after saturation)
         integral_new: Updated integral term
     """
-    phi, omega = state
-    
-    # Define state derivative function
-    def f(state, t, tau):
-        phi, omega = state
-        phi_dot = omega
-        omega_dot = (tau - b * omega) / I
-        return np.array([phi_dot, omega_dot])
-    
     # Get control torque at current state
-    tau, integral = controller_func(phi, omega, t)
+    tau, integral = controller_func(phi, omega, phi_sun_t)
     
     # Apply saturation
-    tau_sat = np.clip(tau, -tau_max, tau_max)
+    tau_sat = min(max(tau, -tau_max), tau_max)
     
-    # RK4 coefficients
-    k1 = f(state, t, tau_sat)
-    k2 = f(state + 0.5 * dt * k1, t + 0.5 * dt, tau_sat)
-    k3 = f(state + 0.5 * dt * k2, t + 0.5 * dt, tau_sat)
-    k4 = f(state + dt * k3, t + dt, tau_sat)
+    # RK4 stages on scalar state, torque held constant over the step
+    phi_new, omega_new = _rk4_scalar(phi, omega, tau_sat, dt, I, b)
     
-    # Update state
-    new_state = state + (dt / 6.0) * (k1 + 2*k2 + 2*k3 + k4)
-    
-    return new_state, tau_sat, integral
+    return phi_new, omega_new, tau_sat, integral
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _dynamics(omega, tau, I, b):
+    """
+    Scalar state derivative for the compiled simulation core.
+
+    Returns:
+        (φ̇, ω̇) as two floats
+    """
+    return omega, (tau - b * omega) / I
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _rk4_scalar(phi, omega, tau, dt, I, b):
+    """
+    RK4 step on scalar state (φ, ω) with constant torque over the step.
+
+    Returns:
+        (φ_new, ω_new)
+    """
+    k1p, k1w = _dynamics(omega, tau, I, b)
+    k2p, k2w = _dynamics(omega + 0.5 * dt * k1w, tau, I, b)
+    k3p, k3w = _dynamics(omega + 0.5 * dt * k2w, tau, I, b)
+    k4p, k4w = _dynamics(omega + dt * k3w, tau, I, b)
+
+    phi_new = phi + (dt / 6.0) * (k1p + 2*k2p + 2*k3p + k4p)
+    omega_new = omega + (dt / 6.0) * (k1w + 2*k2w + 2*k3w + k4w)
+
+    return phi_new, omega_new
 
 
 # ============================================================================
 # PI CONTROLLER WITH ANTI-WINDUP
 # ============================================================================
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _pi_control(error, omega, integral, Kp, Ki, Kd, tau_max, dt):
+    """
+    Scalar PI(D) law with saturation and clamping anti-windup.
+
+    Returns:
+        tau_sat: Saturated control torque
+        integral: Updated integral term
+    """
+    # Total control signal (before saturation)
+    tau = Kp * error + Ki * integral - Kd * omega
+    tau_sat = min(max(tau, -tau_max), tau_max)
+
+    # Anti-windup: only integrate if not saturated
+    # or if integration would help (error and integral have opposite signs)
+    if abs(tau) <= tau_max or error * integral < 0:
+        integral += error * dt
+
+    return tau_sat, integral
+
+
 class PIController:
     """
     PI Controller with anti-windup (clamping method).
@@ -151,42 +205,26 @@ class PIController:
         self.integral = 0.0
         self.prev_error = 0.0
         
-    def compute(self, phi, omega, t):
+    def compute(self, phi, omega, phi_sun_t):
         """
         Compute control torque.
         
         Args:
             phi: Current angle (degrees)
             omega: Current angular velocity (deg/s)
-            t: Current time
+            phi_sun_t: Sun azimuth setpoint at the current time (degrees)
         
         Returns:
             tau: Control torque (before saturation)
             integral: Updated integral term
         """
         # Tracking error
-        error = phi_sun(t) - phi
-        
-        # Proportional term
-        p_term = self.Kp * error
-        
-        # Integral term (will be updated after checking saturation)
-        i_term = self.Ki * self.integral
-        
-        # Derivative term (optional)
-        d_term = -self.Kd * omega  # Negative feedback on velocity
+        error = phi_sun_t - phi
         
-        # Total control signal (before saturation)
-        tau = p_term + i_term + d_term
-        
-        # Check if saturated
-        tau_sat = np.clip(tau, -self.tau_max, self.tau_max)
-        is_saturated = (abs(tau) > self.tau_max)
-        
-        # Anti-windup: only integrate if not saturated
-        # or if integration would help (error and integral have opposite signs)
-        if not is_saturated or (error * self.integral < 0):
-            self.integral += error * dt
+        tau_sat, self.integral = _pi_control(
+            error, omega, self.integral,
+            self.Kp, self.Ki, self.Kd, self.tau_max, dt
+        )
         
         self.prev_error = error
         
@@ -201,6 +239,59 @@ class PIController:
 # ============================================================================
 # SIMULATION FUNCTION
 # ============================================================================
+def _time_grid():
+    """
+    Simulation time points spaced exactly dt apart: 0, dt, ..., T_sim - dt.
+    """
+    N_steps = int(round(T_sim / dt))
+    return dt * np.arange(N_steps, dtype=np.float64)
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _simulate_core(phi_sun_array, phi0, Kp, Ki, Kd, I, b, tau_max, dt):
+    """
+    Compiled simulation loop on scalar state (φ, ω, integral).
+    
+    The sun reference is read from a precomputed table (torque is held
+    constant over each RK4 step, so no mid-step lookups are needed). The
+    PI law, saturation and RK4 stages are inlined so no per-step arrays
+    or Python calls are made.
+    
+    Returns:
+        phi_array, omega_array, tau_array, error_array
+    """
+    N = phi_sun_array.shape[0]
+    phi_array = np.empty(N)
+    omega_array = np.empty(N)
+    tau_array = np.empty(N)
+    error_array = np.empty(N)
+    
+    phi = phi0
+    omega = 0.0
+    integral = 0.0
+    
+    for i in range(N):
+        # Store current state
+        error = phi_sun_array[i] - phi
+        phi_array[i] = phi
+        omega_array[i] = omega
+        error_array[i] = error
+        
+        # Compute control (logged torque)
+        tau, integral = _pi_control(error, omega, integral,
+                                    Kp, Ki, Kd, tau_max, dt)
+        tau_array[i] = tau
+        
+        # RK4 step; the controller is sampled again for the step torque,
+        # exactly as the original PIController/rk4_step pairing did
+        if i < N - 1:
+            tau, integral = _pi_control(error, omega, integral,
+                                        Kp, Ki, Kd, tau_max, dt)
+            phi, omega = _rk4_scalar(phi, omega, tau, dt, I, b)
+    
+    return phi_array, omega_array, tau_array, error_array
+
+
 def simulate_tracker(phi_0, Kp, Ki, Kd=0.0):
     """
     Run complete simulation of solar tracker.
@@ -218,40 +309,304 @@ def simulate_tracker(phi_0, Kp, Ki, Kd=0.0):
         tau_array: Applied torques
         error_array: Tracking errors
     """
-    # Initialize controller
-    controller = PIController(Kp, Ki, Kd, tau_max)
+    # Time array (exact dt spacing, matching the RK4 step)
+    t_array = _time_grid()
     
-    # Initial state
-    state = np.array([phi_0, 0.0])  # [angle, angular_velocity]
+    # Sun trajectory evaluated once over the whole time grid
+    phi_sun_table = phi_sun(t_array)
     
-    # Time array
-    N_steps = int(T_sim / dt)
-    t_array = np.linspace(0, T_sim, N_steps)
+    # Compiled simulation loop
+    phi_array, omega_array, tau_array, error_array = _simulate_core(
+        phi_sun_table, float(phi_0), float(Kp), float(Ki), float(Kd),
+        I, b, tau_max, dt
+    )
     
-    # Storage arrays
-    phi_array = np.zeros(N_steps)
-    omega_array = np.zeros(N_steps)
-    tau_array = np.zeros(N_steps)
-    error_array = np.zeros(N_steps)
+    return t_array, phi_array, omega_array, tau_array, error_array
+
+
+def make_simulator(Kp, Ki, Kd=0.0):
+    """
+    Build a simulator specialized on one set of gains.
+    
+    The gains and plant constants are captured as closure variables, which
+    Numba freezes into the compiled kernel as literals. Reuse the returned
+    function when only phi_0 varies; a new gain set needs a new simulator
+    (and a fresh compile).
     
-    # Simulation loop
-    for i, t in enumerate(t_array):
+    Args:
+        Kp: Proportional gain
+        Ki: Integral gain
+        Kd: Derivative gain (optional)
+    
+    Returns:
+        simulate(phi_0) -> (t_array, phi_array, omega_array, tau_array,
+        error_array), same outputs as simulate_tracker
+    """
+    Kp, Ki, Kd = float(Kp), float(Ki), float(Kd)
+    
+    @njit(fastmath=True, boundscheck=False)
+    def _run(phi_sun_array, phi0):
+        # Gains (closure) and I, b, tau_max, dt (globals) are compile-time
+        # constants here, so they fold into the inlined _simulate_core loop
+        return _simulate_core(phi_sun_array, phi0, Kp, Ki, Kd,
+                              I, b, tau_max, dt)
+    
+    t_array = _time_grid()
+    phi_sun_table = phi_sun(t_array)
+    
+    def simulate(phi_0):
+        phi_array, omega_array, tau_array, error_array = _run(
+            phi_sun_table, float(phi_0)
+        )
+        return t_array, phi_array, omega_array, tau_array, error_array
+    
+    return simulate
+
+
+@njit(cache=True, parallel=True, fastmath=True, boundscheck=False)
+def _simulate_batch_core(phi_sun_array, phi0_arr, Kp_arr, Ki_arr, Kd_arr,
+                         I, b, tau_max, dt):
+    """
+    Run M independent simulations in parallel; row m of each output
+    holds the trajectory for the m-th parameter tuple.
+    """
+    M = phi0_arr.shape[0]
+    N = phi_sun_array.shape[0]
+    phi_out = np.empty((M, N))
+    omega_out = np.empty((M, N))
+    tau_out = np.empty((M, N))
+    error_out = np.empty((M, N))
+    
+    for m in prange(M):
+        phi_m, omega_m, tau_m, error_m = _simulate_core(
+            phi_sun_array, phi0_arr[m], Kp_arr[m], Ki_arr[m], Kd_arr[m],
+            I, b, tau_max, dt
+        )
+        phi_out[m] = phi_m
+        omega_out[m] = omega_m
+        tau_out[m] = tau_m
+        error_out[m] = error_m
+    
+    return phi_out, omega_out, tau_out, error_out
+
+
+def simulate_batch(phi0_arr, Kp_arr, Ki_arr, Kd_arr=0.0, n_threads=None):
+    """
+    Run a batch of independent simulations across CPU cores.
+    
+    Each argument may be a scalar or an array of length M; scalars are
+    broadcast so e.g. a sweep over initial angles can share one gain set.
+    
+    Args:
+        phi0_arr: Initial angles (degrees)
+        Kp_arr: Proportional gains
+        Ki_arr: Integral gains
+        Kd_arr: Derivative gains (optional)
+        n_threads: Number of worker threads (default: all cores)
+    
+    Returns:
+        t_array: Time points, shape (N,)
+        phi_array, omega_array, tau_array, error_array: shape (M, N)
+    """
+    if n_threads is not None:
+        set_num_threads(n_threads)
+    
+    phi0_arr, Kp_arr, Ki_arr, Kd_arr = (
+        np.ascontiguousarray(a, dtype=np.float64)
+        for a in np.broadcast_arrays(
+            np.atleast_1d(phi0_arr), Kp_arr, Ki_arr, Kd_arr
+        )
+    )
+    
+    t_array = _time_grid()
+    phi_sun_table = phi_sun(t_array)
+    
+    phi_array, omega_array, tau_array, error_array = _simulate_batch_core(
+        phi_sun_table, phi0_arr, Kp_arr, Ki_arr, Kd_arr,
+        I, b, tau_max, dt
+    )
+    
+    return t_array, phi_array, omega_array, tau_array, error_array
+
+
+def simulate_tracker_batch(phi0_vec, Kp_vec, Ki_vec, Kd_vec=0.0):
+    """
+    Run a batch of simulations in lockstep with NumPy vector operations.
+    
+    All M trackers advance together, so each time step costs a fixed
+    handful of length-M ufunc calls instead of M Python-level steps. That
+    per-step overhead only pays off for large M (when Numba is not
+    available); for a few trackers, sequential simulate_tracker calls are
+    faster. The step sequence matches _simulate_core exactly.
+    
+    Args:
+        phi0_vec: Initial angles (degrees)
+        Kp_vec: Proportional gains
+        Ki_vec: Integral gains
+        Kd_vec: Derivative gains (optional)
+    
+    Returns:
+        t_array: Time points, shape (N,)
+        phi_array, omega_array, tau_array, error_array: shape (M, N)
+    """
+    phi0_vec, Kp_vec, Ki_vec, Kd_vec = (
+        np.array(a, dtype=np.float64)
+        for a in np.broadcast_arrays(
+            np.atleast_1d(phi0_vec), Kp_vec, Ki_vec, Kd_vec
+        )
+    )
+    
+    t_array = _time_grid()
+    phi_sun_table = phi_sun(t_array)
+    
+    M = phi0_vec.shape[0]
+    N_steps = t_array.shape[0]
+    phi_array = np.empty((M, N_steps))
+    omega_array = np.empty((M, N_steps))
+    tau_array = np.empty((M, N_steps))
+    error_array = np.empty((M, N_steps))
+    
+    phi = phi0_vec
+    omega = np.zeros(M)
+    integral = np.zeros(M)
+    
+    def control(error, omega, integral):
+        # Vector form of _pi_control (anti-windup via boolean mask)
+        tau = Kp_vec * error + Ki_vec * integral - Kd_vec * omega
+        tau_sat = np.clip(tau, -tau_max, tau_max)
+        windup_ok = (np.abs(tau) <= tau_max) | (error * integral < 0)
+        return tau_sat, np.where(windup_ok, integral + error * dt, integral)
+    
+    for i in range(N_steps):
         # Store current state
-        phi_array[i] = state[0]
-        omega_array[i] = state[1]
-        error_array[i] = phi_sun(t) - state[0]
+        error = phi_sun_table[i] - phi
+        phi_array[:, i] = phi
+        omega_array[:, i] = omega
+        error_array[:, i] = error
         
-        # Compute control and integrate
-        tau, _ = controller.compute(state[0], state[1], t)
-        tau_array[i] = tau
+        # Compute control (logged torque)
+        tau, integral = control(error, omega, integral)
+        tau_array[:, i] = tau
         
-        # RK4 step
+        # RK4 step with the controller sampled again, as in _simulate_core
         if i < N_steps - 1:
-            state, _, _ = rk4_step(
-                state, t, dt,
-                lambda p, o, t: controller.compute(p, o, t),
-                tau_max, I, b
-            )
+            tau, integral = control(error, omega, integral)
+            
+            # RK4 stages across M (dynamics: φ̇ = ω, ω̇ = (τ - bω)/I)
+            k1p = omega
+            k1w = (tau - b * k1p) / I
+            k2p = omega + 0.5 * dt * k1w
+            k2w = (tau - b * k2p) / I
+            k3p = omega + 0.5 * dt * k2w
+            k3w = (tau - b * k3p) / I
+            k4p = omega + dt * k3w
+            k4w = (tau - b * k4p) / I
+            phi = phi + (dt / 6.0) * (k1p + 2*k2p + 2*k3p + k4p)
+            omega = omega + (dt / 6.0) * (k1w + 2*k2w + 2*k3w + k4w)
+    
+    return t_array, phi_array, omega_array, tau_array, error_array
+
+
+_simulate_jax_batch = None
+
+
+def _jax_batch_kernel():
+    """
+    Import JAX on first use and build the jitted, vmapped batch kernel.
+    
+    Raises ImportError when JAX is not installed.
+    """
+    global _simulate_jax_batch
+    import jax
+    import jax.numpy as jnp
+    
+    if _simulate_jax_batch is not None:
+        return _simulate_jax_batch, jnp
+    
+    def _simulate_jax(phi_sun_table, phi0, Kp, Ki, Kd):
+        """
+        Single-tracker simulation as a lax.scan over the sun table; the
+        step sequence matches _simulate_core.
+        """
+        def control(error, omega, integral):
+            tau = Kp * error + Ki * integral - Kd * omega
+            tau_sat = jnp.clip(tau, -tau_max, tau_max)
+            windup_ok = (jnp.abs(tau) <= tau_max) | (error * integral < 0)
+            return tau_sat, jnp.where(windup_ok, integral + error * dt, integral)
+        
+        def step(carry, phi_s):
+            phi, omega, integral = carry
+            error = phi_s - phi
+            
+            # Logged torque, then the step torque (controller sampled twice)
+            tau_log, integral = control(error, omega, integral)
+            tau, integral = control(error, omega, integral)
+            
+            # RK4 stages (dynamics: φ̇ = ω, ω̇ = (τ - bω)/I)
+            k1p = omega
+            k1w = (tau - b * k1p) / I
+            k2p = omega + 0.5 * dt * k1w
+            k2w = (tau - b * k2p) / I
+            k3p = omega + 0.5 * dt * k2w
+            k3w = (tau - b * k3p) / I
+            k4p = omega + dt * k3w
+            k4w = (tau - b * k4p) / I
+            phi_new = phi + (dt / 6.0) * (k1p + 2*k2p + 2*k3p + k4p)
+            omega_new = omega + (dt / 6.0) * (k1w + 2*k2w + 2*k3w + k4w)
+            
+            return (phi_new, omega_new, integral), (phi, omega, tau_log, error)
+        
+        carry0 = (phi0, jnp.zeros_like(phi0), jnp.zeros_like(phi0))
+        _, outputs = jax.lax.scan(step, carry0, phi_sun_table)
+        return outputs
+    
+    _simulate_jax_batch = jax.jit(
+        jax.vmap(_simulate_jax, in_axes=(None, 0, 0, 0, 0))
+    )
+    return _simulate_jax_batch, jnp
+
+
+def simulate_batch_gpu(phi0_vec, Kp_vec, Ki_vec, Kd_vec=0.0):
+    """
+    Run a large batch of simulations on the GPU with JAX.
+    
+    Each trajectory is a lax.scan over time and the batch is vmapped, so
+    thousands of candidates run as parallel device threads. JAX computes
+    in float32 unless jax_enable_x64 is set. Without JAX this falls back
+    to simulate_tracker_batch on the CPU.
+    
+    Args:
+        phi0_vec: Initial angles (degrees)
+        Kp_vec: Proportional gains
+        Ki_vec: Integral gains
+        Kd_vec: Derivative gains (optional)
+    
+    Returns:
+        t_array: Time points, shape (N,)
+        phi_array, omega_array, tau_array, error_array: shape (M, N)
+    """
+    try:
+        simulate_jax_batch, jnp = _jax_batch_kernel()
+    except ImportError:
+        # JAX is optional: fall back to the NumPy batch
+        return simulate_tracker_batch(phi0_vec, Kp_vec, Ki_vec, Kd_vec)
+    
+    t_array = _time_grid()
+    phi_sun_table = jnp.asarray(phi_sun(t_array))
+    
+    # Match the table's float dtype so the scan carry keeps one type
+    phi0_vec, Kp_vec, Ki_vec, Kd_vec = (
+        jnp.asarray(a, dtype=phi_sun_table.dtype)
+        for a in np.broadcast_arrays(
+            np.atleast_1d(phi0_vec), Kp_vec, Ki_vec, Kd_vec
+        )
+    )
+    
+    phi_array, omega_array, tau_array, error_array = (
+        np.asarray(a) for a in simulate_jax_batch(
+            phi_sun_table, phi0_vec, Kp_vec, Ki_vec, Kd_vec
+        )
+    )
     
     return t_array, phi_array, omega_array, tau_array, error_array
 
@@ -259,6 +614,29 @@ def simulate_tracker(phi_0, Kp, Ki, Kd=0.0):
 # ============================================================================
 # ENERGY CALCULATION
 # ============================================================================
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _energy(t_array, phi_array, amplitude, period):
+    """
+    One-pass trapezoidal integral of cos(φ_sun - φ) over the time grid.
+    
+    The sun angle is evaluated inline so the arrays are streamed once.
+    """
+    N = t_array.shape[0]
+    if N < 2:
+        return 0.0
+    
+    f_prev = math.cos(math.radians(
+        amplitude * math.sin(math.pi * t_array[0] / period) - phi_array[0]))
+    energy = 0.0
+    for i in range(1, N):
+        f_i = math.cos(math.radians(
+            amplitude * math.sin(math.pi * t_array[i] / period) - phi_array[i]))
+        energy += 0.5 * (f_prev + f_i) * (t_array[i] - t_array[i - 1])
+        f_prev = f_i
+    
+    return energy
+
+
 def calculate_energy(t_array, phi_array):
     """
     Calculate energy captured (proportional to cos(angle_diff)).
@@ -272,22 +650,25 @@ def calculate_energy(t_array, phi_array):
     Returns:
         energy: Total energy captured
     """
-    # Sun angles at each time
-    phi_sun_array = phi_sun(t_array)
-    
-    # Angle difference (convert to radians for cosine)
-    angle_diff = np.deg2rad(phi_sun_array - phi_array)
-    
-    # Energy is proportional to cos(difference)
-    energy = np.trapezoid(np.cos(angle_diff), t_array)
+    # Same trajectory as phi_sun(): 45*sin(π*t/T_sim), fused into the kernel
+    energy = _energy(
+        np.ascontiguousarray(t_array, dtype=np.float64),
+        np.ascontiguousarray(phi_array, dtype=np.float64),
+        45.0, T_sim
+    )
     
     return energy
 
 
-def energy_comparison(t_array, phi_tracker):
+def energy_comparison(t_array, phi_tracker, phi_sun_arr=None):
     """
     Compare tracker energy vs fixed panels.
     
+    Args:
+        t_array: Time points
+        phi_tracker: Tracker angles (degrees)
+        phi_sun_arr: Precomputed phi_sun(t_array) (optional)
+    
     Returns:
         Dictionary with energy values and ratios
     """
@@ -302,13 +683,15 @@ def energy_comparison(t_array, phi_tracker):
     # For symmetric trajectory -45° to +45°, best is at 0°
     # But let's check a few angles
     angles_to_test = np.linspace(-45, 45, 19)
-    energies = []
-    for angle in angles_to_test:
-        phi_fixed = np.full_like(t_array, angle)
-        energies.append(calculate_energy(t_array, phi_fixed))
     
-    E_fixed_best = max(energies)
-    best_angle = angles_to_test[np.argmax(energies)]
+    # Evaluate all fixed angles at once: (n_angles, N) angle differences
+    phi_sun_array = phi_sun(t_array) if phi_sun_arr is None else phi_sun_arr
+    angle_diff = np.deg2rad(phi_sun_array[None, :] - angles_to_test[:, None])
+    energies = np.trapezoid(np.cos(angle_diff), t_array, axis=1)
+    
+    best_idx = np.argmax(energies)
+    E_fixed_best = energies[best_idx]
+    best_angle = angles_to_test[best_idx]
     
     results = {
         'E_tracker': E_tracker,
@@ -325,11 +708,14 @@ def energy_comparison(t_array, phi_tracker):
 # ============================================================================
 # VISUALIZATION
 # ============================================================================
-def plot_results(t_array, phi_array, tau_array, error_array, Kp, Ki, Kd):
+def plot_results(t_array, phi_array, tau_array, error_array, Kp, Ki, Kd,
+                 phi_sun_arr=None):
     """
     Generate comprehensive time-domain plots.
+    
+    phi_sun_arr may pass a precomputed phi_sun(t_array) to skip re-evaluation.
     """
-    phi_sun_array = phi_sun(t_array)
+    phi_sun_array = phi_sun(t_array) if phi_sun_arr is None else phi_sun_arr
     
     fig, axes = plt.subplots(4, 1, figsize=(12, 10))
     fig.suptitle(f'Solar Tracker Performance (Kp={Kp}, Ki={Ki}, Kd={Kd})', 
@@ -363,11 +749,10 @@ def plot_results(t_array, phi_array, tau_array, error_array, Kp, Ki, Kd):
     axes[2].set_title('Applied Motor Torque')
     
     # Plot 4: Error after 10s (zoomed)
-    t_mask = t_array >= 10
-    axes[3].plot(t_array[t_mask], error_array[t_mask], 'g-', linewidth=1.5)
+    axes[3].plot(t_array[i10:], error_array[i10:], 'g-', linewidth=1.5)
     axes[3].axhline(y=0.5, color='r', linestyle='--', label='±0.5° requirement', alpha=0.7)
     axes[3].axhline(y=-0.5, color='r', linestyle='--', alpha=0.7)
-    axes[3].fill_between(t_array[t_mask], -0.5, 0.5, alpha=0.2, color='green')
+    axes[3].fill_between(t_array[i10:], -0.5, 0.5, alpha=0.2, color='green')
     axes[3].set_ylabel('Error (degrees)', fontsize=11)
     axes[3].set_xlabel('Time (seconds)', fontsize=11)
     axes[3].legend(loc='upper right')
@@ -382,9 +767,12 @@ def plot_results(t_array, phi_array, tau_array, error_array, Kp, Ki, Kd):
     return fig
 
 
-def create_animation(t_array, phi_array, error_array, filename='tracker_animation.mp4'):
+def create_animation(t_array, phi_array, error_array, filename='tracker_animation.mp4',
+                     phi_sun_arr=None):
     """
     Create 20-30s animation showing compass view and error subplot.
+    
+    phi_sun_arr may pass a precomputed phi_sun(t_array) to skip re-evaluation.
     """
     # Subsample for animation (aim for 30 fps, ~25s duration)
     fps = 30
@@ -396,7 +784,13 @@ def create_animation(t_array, phi_array, error_array, filename='tracker_animatio
     t_anim = t_array[::step]
     phi_anim = phi_array[::step]
     error_anim = error_array[::step]
-    phi_sun_anim = phi_sun(t_anim)
+    phi_sun_anim = phi_sun(t_anim) if phi_sun_arr is None else phi_sun_arr[::step]
+    
+    # Display-only data: float32 is ample precision and halves the bytes
+    t_anim, phi_anim, error_anim, phi_sun_anim = (
+        a.astype(np.float32, copy=False)
+        for a in (t_anim, phi_anim, error_anim, phi_sun_anim)
+    )
     
     # Setup figure
     fig = plt.figure(figsize=(14, 6))
@@ -433,11 +827,15 @@ def create_animation(t_array, phi_array, error_array, filename='tracker_animatio
     ax2.grid(True, alpha=0.3)
     ax2.legend(loc='upper right')
     
+    # Error trace buffers, filled in place as frames advance (NaN is not drawn)
+    t_buf = np.full(len(t_anim), np.nan, dtype=np.float32)
+    e_buf = np.full(len(t_anim), np.nan, dtype=np.float32)
+    
     # Animation function
     def animate(frame):
         # Convert angles to radians for polar plot
-        theta_sun = np.deg2rad(phi_sun_anim[frame])
-        theta_tracker = np.deg2rad(phi_anim[frame])
+        theta_sun = math.radians(phi_sun_anim[frame])
+        theta_tracker = math.radians(phi_anim[frame])
         
         # Update sun position
         sun_marker.set_data([theta_sun], [0.9])
@@ -446,22 +844,28 @@ def create_animation(t_array, phi_array, error_array, filename='tracker_animatio
         tracker_line.set_data([theta_tracker, theta_tracker], [0, 0.7])
         
         # Update error plot
-        error_line.set_data(t_anim[:frame+1], error_anim[:frame+1])
+        if frame == 0:
+            t_buf.fill(np.nan)  # start a fresh trace on each write pass
+            e_buf.fill(np.nan)
+        t_buf[frame] = t_anim[frame]
+        e_buf[frame] = error_anim[frame]
+        error_line.set_data(t_buf, e_buf)
         time_marker.set_data([t_anim[frame]], [error_anim[frame]])
         
         # Add time annotation
         ax1.set_title(f'Azimuth Tracking (t = {t_anim[frame]:.1f} s)', 
                      fontsize=14, fontweight='bold', pad=20)
-        
-        return sun_marker, tracker_line, error_line, time_marker
     
-    # Create animation
-    anim = FuncAnimation(fig, animate, frames=len(t_anim), 
-                        interval=1000/fps, blit=True, repeat=True)
+    def write_frames(writer, path, dpi):
+        # Stream frames to the encoder one at a time
+        with writer.saving(fig, path, dpi):
+            for frame in range(len(t_anim)):
+                animate(frame)
+                writer.grab_frame()
     
     # Save animation
     try:
-        anim.save(filename, writer='ffmpeg', fps=fps, dpi=150)
+        write_frames(FFMpegWriter(fps=fps, bitrate=4000), filename, dpi=100)
         print(f"✓ Saved: {filename}")
     except Exception as e:
         print(f"✗ Could not save animation: {e}")
@@ -469,7 +873,7 @@ def create_animation(t_array, phi_array, error_array, filename='tracker_animatio
         # Try GIF as fallback
         try:
             gif_name = filename.replace('.mp4', '.gif')
-            anim.save(gif_name, writer='pillow', fps=fps)
+            write_frames(PillowWriter(fps=fps), gif_name, dpi=100)
             print(f"✓ Saved GIF instead: {gif_name}")
         except:
             print("  Could not save GIF either. Animation will be skipped.")
@@ -515,11 +919,11 @@ if __name__ == "__main__":
     phi_0 = 0.0
     print(f"Simulating with phi(0) = {phi_0} degrees...")
     t, phi, omega, tau, error = simulate_tracker(phi_0, Kp, Ki, Kd)
+    phi_sun_arr = phi_sun(t)  # shared by the energy, plot and animation steps
     
     # Check performance requirement
     print(f"\nPerformance Check:")
-    t_mask = t >= 10.0
-    max_error_after_10s = np.max(np.abs(error[t_mask]))
+    max_error_after_10s = np.abs(error[i10:]).max()
     print(f"  Max |error| after 10s: {max_error_after_10s:.4f} deg")
     if max_error_after_10s <= 0.5:
         print("  [PASS] Requirement (<= 0.5 deg)")
@@ -529,7 +933,7 @@ if __name__ == "__main__":
     
     # Energy comparison
     print(f"\nEnergy Analysis:")
-    energy_results = energy_comparison(t, phi)
+    energy_results = energy_comparison(t, phi, phi_sun_arr=phi_sun_arr)
     print(f"  Tracker energy:       {energy_results['E_tracker']:.2f}")
     print(f"  Fixed at 0 deg:       {energy_results['E_fixed_0']:.2f}")
     print(f"  Best fixed angle:     {energy_results['best_fixed_angle']:.1f} deg")
@@ -545,23 +949,24 @@ if __name__ == "__main__":
     print("GENERATING OUTPUTS...")
     print(f"{'='*70}\n")
     
-    plot_results(t, phi, tau, error, Kp, Ki, Kd)
+    plot_results(t, phi, tau, error, Kp, Ki, Kd, phi_sun_arr=phi_sun_arr)
     
     # Create animation
     print("\nCreating animation (this may take a minute)...")
-    create_animation(t, phi, error, 'tracker_animation.mp4')
+    create_animation(t, phi, error, 'tracker_animation.mp4',
+                     phi_sun_arr=phi_sun_arr)
     
     # Test robustness with different initial conditions
     print(f"\n{'='*70}")
     print("ROBUSTNESS TESTING")
     print(f"{'='*70}\n")
     
-    for phi_init in initial_angles:
-        if phi_init == phi_0:
-            continue  # Already tested
+    robust_angles = [a for a in initial_angles if a != phi_0]  # phi_0 already tested
+    _, _, _, _, err_batch = simulate_batch(robust_angles, Kp, Ki, Kd)
+    
+    for phi_init, err in zip(robust_angles, err_batch):
         print(f"\nTesting phi(0) = {phi_init} deg...")
-        _, _, _, _, err = simulate_tracker(phi_init, Kp, Ki, Kd)
-        max_err = np.max(np.abs(err[t >= 10.0]))
+        max_err = np.abs(err[i10:]).max()
         status = "✓ PASS" if max_err <= 0.5 else "✗ FAIL"
         print(f"  Max |error| after 10s: {max_err:.4f} deg [{status}]")
     